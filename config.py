@@ -1,19 +1,90 @@
+import copy
+import functools
 import json
-import re
+import mmap
+import os
+
+
+def strip_jsonc(content) -> bytes:
+    """Remove // and /* */ comments from JSON bytes (or an mmap), leaving strings intact."""
+    out = []
+    i = 0
+    start = 0
+    end = len(content)
+    # Next known position of each marker; only re-searched once the scan passes
+    # it, and never again once it is missing, which keeps the scan linear
+    quote = content.find(b'"')
+    line = content.find(b'//')
+    block = content.find(b'/*')
+    while i < end:
+        if 0 <= quote < i:
+            quote = content.find(b'"', i)
+        if 0 <= line < i:
+            line = content.find(b'//', i)
+        if 0 <= block < i:
+            block = content.find(b'/*', i)
+        hit = min((pos for pos in (quote, line, block) if pos != -1), default=-1)
+        if hit == -1:
+            break
+
+        if hit == quote:
+            # Skip to the closing quote, stepping over escaped characters
+            i = hit + 1
+            while i < end:
+                close = content.find(b'"', i)
+                if close == -1:
+                    i = end
+                    break
+                backslashes = 0
+                while content[close - 1 - backslashes] == 0x5C:  # backslash
+                    backslashes += 1
+                i = close + 1
+                if backslashes % 2 == 0:
+                    break
+            continue
+
+        out.append(content[start:hit])
+        if hit == line:
+            newline = content.find(b'\n', hit + 2)
+            i = end if newline == -1 else newline
+        else:
+            close = content.find(b'*/', hit + 2)
+            i = end if close == -1 else close + 2
+        start = i
+
+    out.append(content[start:])
+    return b''.join(out)
+
+
+def parse_jsonc(content):
+    """Parse JSON text with // and /* */ comments; otherwise strict JSON."""
+    return json.loads(strip_jsonc(content))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_all(config_path: str, mtime_ns: int):
+    """Read and parse a config file; cached per path and modification time.
+
+    The returned object is shared between calls and must not be mutated.
+    """
+    with open(config_path, 'rb') as config_file, \
+            mmap.mmap(config_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        return parse_jsonc(content)
+
 
 def load_config(config_path: str, config_name: str):
-    """Load configuration from a JSON file with comments."""
+    """Load configuration from a JSON file with comments.
+
+    Returns a fresh copy, so callers may modify it without affecting later calls.
+    """
+    try:
+        configs = _load_all(config_path, os.stat(config_path).st_mtime_ns)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Error loading configuration: {e}") from e
     try:
-        with open(config_path, 'r', encoding='utf-8') as config_file:
-            content = config_file.read()
-            content = re.sub(r'\/\/.*', '', content)  # Remove single line comments
-            content = re.sub(r'\/\*[\s\S]*?\*\/', '', content)  # Remove multi-line comments
-            configs = json.loads(content)
-            if config_name == 'devices':
-                return configs['devices']
-            device_config = configs['devices'].get(config_name)
-            if not device_config:
-                raise ValueError(f"No configuration found for device: {config_name}")
-            return device_config
-    except Exception as e:
-        raise RuntimeError(f"Error loading configuration: {e}")
+        devices = configs['devices']
+        return copy.deepcopy(devices if config_name == 'devices' else devices[config_name])
+    except (KeyError, TypeError):
+        raise RuntimeError(
+            f"Error loading configuration: No configuration found for device: {config_name}"
+        ) from None
@@ -6,17 +6,19 @@ Author: Taylor Schmidt, Michael Chaney
 This is the entrypoint for communicating with a reader via OSDP.
 """
 import logging
+import os
 import sys
+import time
 import argparse
 from typing import List
-import code
 from config import load_config  # Import the load_config function
-import random
-import builtins
 
-from osdplib import comms
-from osdplib.osdpcontroller import OsdpController
-from osdplib.osdp.constants import CommandTags
+def _silent(*args, **kwargs):
+    """Discard console output when --inline-log is set."""
+
+# Console output goes through _emit so --inline-log can silence it without
+# patching builtins.print
+_emit = print
 
 ARG_VERBOSE: List[str] = ["-v", "--verbose"]
 ARG_IBEACON: List[str] = ["-i", "--ibeacon"]
@@ -33,7 +35,7 @@ ARG_COMMAND: List[str] = ["-C", "--command"]
 ARG_LIST_COMMANDS: List[str] = ["-L", "--list-commands"]
 ARG_PORT: List[str] = ["-P", "--port"]
 
-COMMANDS = [
+COMMANDS = (
     "send_ibeacon_mfg",
     "request_conf",
     "transfer_file",
@@ -43,13 +45,60 @@ COMMANDS = [
     "id",
     "cap",
     "lstat",
-]
+    "mfg",
+)
+
+_SUPPORTED_STR = "Supported commands:\n" + "\n".join(f" - {c}" for c in COMMANDS) + "\n"
+
+class CommandSet:
+    """Controller commands available to one-off invocations and the REPL."""
+
+    def __init__(self, controller, args):
+        from osdplib.osdp.constants import CommandTags
+
+        self._controller = controller
+        self._args = args
+        self._tags = CommandTags
+
+    def send_ibeacon_mfg(self):
+        _emit("==== Configure iBeacon config")
+        return self._controller.send_ibeacon_mfg()
+
+    def request_conf(self):
+        _emit("==== Request extended reader config")
+        _emit(self._controller.request_conf())
+
+    def transfer_file(self):
+        _emit("==== Transferring file")
+        _emit(f"filepath {self._args.file}")
+        return self._controller.transfer_file(self._args.file)
+
+    def set_serial_number(self):
+        _emit("==== Setting serial number")
+        return self._controller.dev.set_serial_number(self._args.serial)
+
+    def poll(self):
+        _emit(self._controller.send(self._tags.POLL))
+
+    def poll_forever(self):
+        _emit("==== Polling forever, check osdpcapture.log for events")
+        return self._controller.poll_forever()
+
+    def id(self):
+        return self._controller.send(self._tags.ID)
+
+    def cap(self):
+        return self._controller.send(self._tags.CAP)
+
+    def lstat(self):
+        return self._controller.send(self._tags.LSTAT)
+
+    def mfg(self):
+        return self._controller.send(self._tags.MFG, data=b'\x5c\x26\x23\x57\x49\x03\x00\x00')
 
 def list_supported_commands():
     """Print the list of supported commands."""
-    print("Supported commands:")
-    for command in COMMANDS:
-        print(f" - {command}")
+    sys.stdout.write(_SUPPORTED_STR)
 
 def setup_logging(verbose: bool, inline_log: bool):
     """Set up the logging configuration."""
@@ -60,61 +109,67 @@ def setup_logging(verbose: bool, inline_log: bool):
         logging.basicConfig(stream=sys.stdout, format=format_str, level=log_level)
         destination = "Terminal"
     else:
-        filename = f"./logs/osdpcapture_{random.randint(0, 1000000)}.log"
+        filename = f"./logs/osdpcapture_{os.getpid()}_{time.time_ns()}.log"
         logging.basicConfig(filename=filename, format=format_str, level=log_level)
         destination = filename
 
     logging.info(f"Logging started with level {log_level} to {destination}")
     print(f"Logging started with level {log_level} to {destination}")
 
-def execute_command(args, command_list):
+def execute_command(args, commands):
     """Execute the specified command."""
     try:
         if args.ibeacon:
-            command_list["send_ibeacon_mfg"]()
+            commands.send_ibeacon_mfg()
             sys.exit(0)
 
         if args.file:
-            command_list["transfer_file"]()
+            commands.transfer_file()
             sys.exit(0)
 
         if args.serial:
-            command_list["set_serial_number"]()
+            commands.set_serial_number()
             sys.exit(0)
 
         if args.command:
-            command_func = command_list.get(args.command)
-            if command_func:
-                command_result = command_func()
+            if args.command in COMMANDS:
+                command_result = getattr(commands, args.command)()
                 logging.info(f"Command '{args.command}' result: {command_result}")
-                print(f"Command '{args.command}' result: {command_result}")
+                _emit(f"Command '{args.command}' result: {command_result}")
             else:
-                print(f"Command '{args.command}' not found.")
+                _emit(f"Command '{args.command}' not found.")
             if not args.poll:
                 sys.exit(0)
 
         if args.poll:
-            command_list["poll_forever"]()
+            commands.poll_forever()
             sys.exit(0)
 
         if args.repl:
-            start_repl(command_list)
+            start_repl(commands)
     except KeyboardInterrupt:
-        print("user initiated exit")
+        _emit("user initiated exit")
         sys.exit(2)
 
-def start_repl(command_list):
+def start_repl(commands):
     """Start a REPL session."""
-    print("==== Starting REPL session")
+    import code
+    # Imported here so they are exposed to the REPL namespace via locals()
+    from osdplib import comms  # noqa: F401
+    from osdplib.osdpcontroller import OsdpController  # noqa: F401
+    from osdplib.osdp.constants import CommandTags  # noqa: F401
+
+    _emit("==== Starting REPL session")
     variables = globals().copy()
     variables.update(locals())
-    variables.update(command_list)
+    variables.update({name: getattr(commands, name) for name in COMMANDS})
     shell = code.InteractiveConsole(variables)
     shell.interact()
     sys.exit(0)
 
 def main():
     """Main function to parse arguments and execute commands."""
+    global _emit
     parser = argparse.ArgumentParser(description="WaveLynx OSDP Console")
     parser.add_argument("-v", "--verbose", action="store_true", help="increase output verbosity")
     parser.add_argument("-i", "--ibeacon", action="store_true", help="configure iBeacon config")
@@ -144,6 +199,7 @@ def main():
     )
 
     args = parser.parse_args()
+    _emit = _silent if args.inline_log else print
 
     if args.list_commands:
         list_supported_commands()
@@ -153,6 +209,9 @@ def main():
         parser.print_help()
         sys.exit(0)
 
+    from osdplib import comms
+    from osdplib.osdpcontroller import OsdpController
+
     # Flush existing log file only if not using inline logging
     if args.flush_log and not args.inline_log:
         with open("./osdpcapture.log", 'w', encoding='utf-8'):
@@ -160,10 +219,7 @@ def main():
 
     setup_logging(args.verbose, args.inline_log)
 
-    if args.inline_log:
-        builtins.print = lambda *args, **kwargs: None
-
-    print("======== WaveLynx OSDP Console ========")
+    _emit("======== WaveLynx OSDP Console ========")
 
     # Determine the port and baud rate to use
     if args.config:
@@ -176,36 +232,17 @@ def main():
     baud_rate = args.baud if args.baud else 9600
 
     if not port:
-        print("No port selected, exiting.")
+        _emit("No port selected, exiting.")
         sys.exit(1)
 
     # Initialize the OsdpController with or without secure mode
     controller = OsdpController(port, baud_rate=baud_rate, secure=args.secure)
 
-    print(f"==== Device connected at: {port} with baud rate: {baud_rate}")
+    _emit(f"==== Device connected at: {port} with baud rate: {baud_rate}")
 
     logging.info("==== ARGS %s", sys.argv[1:])
 
-    command_list = {
-        "send_ibeacon_mfg": lambda: print("==== Configure iBeacon config")
-                                or controller.send_ibeacon_mfg(),
-        "request_conf": lambda: print("==== Request extended reader config")
-                              or print(controller.request_conf()),
-        "transfer_file": lambda: print("==== Transferring file")
-                                or print(f"filepath {args.file}")
-                                or controller.transfer_file(args.file),
-        "set_serial_number": lambda: print("==== Setting serial number")
-                                   or controller.dev.set_serial_number(args.serial),
-        "poll": lambda: print(controller.send(CommandTags.POLL)),
-        "poll_forever": lambda: print("==== Polling forever, check osdpcapture.log for events")
-                               or controller.poll_forever(),
-        "id": lambda:	controller.send(CommandTags.ID),
-        "cap": lambda: controller.send(CommandTags.CAP),
-        "lstat": lambda: controller.send(CommandTags.LSTAT),
-        "mfg": lambda: controller.send(CommandTags.MFG, data=b'\x5c\x26\x23\x57\x49\x03\x00\x00'),
-    }
-
-    execute_command(args, command_list)
+    execute_command(args, CommandSet(controller, args))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from config import load_config, strip_jsonc
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+
+@pytest.mark.parametrize('content, expected', [
+    (b'{"a": "b//c"}', b'{"a": "b//c"}'),
+    (b'{"a": "x\\"//y"} // comment', b'{"a": "x\\"//y"} '),
+    (b'{"a": "\\\\"} // comment\n', b'{"a": "\\\\"} \n'),
+    (b'{"a": "/*"} /* comment */', b'{"a": "/*"} '),
+    (b'{"a": 1} /* unterminated', b'{"a": 1} '),
+])
+def test_strip_jsonc(content, expected):
+    assert strip_jsonc(content) == expected
+
+
+def test_load_shipped_config():
+    devices = load_config(CONFIG_PATH, 'devices')
+    assert 'example' not in devices
+    assert load_config(CONFIG_PATH, 'lock') == devices['lock']
+
+
+def test_load_config_returns_copy():
+    load_config(CONFIG_PATH, 'lock')['port'] = 'changed'
+    assert load_config(CONFIG_PATH, 'lock')['port'] != 'changed'
+
+
+@pytest.mark.parametrize('content', [
+    '{"devices": {"a": {"port": "x",},}}',
+    '[1, 2]',
+    '{"devices": {}}',
+])
+def test_load_config_errors(tmp_path, content):
+    path = tmp_path / 'config.json'
+    path.write_text(content)
+    with pytest.raises(RuntimeError, match='Error loading configuration'):
+        load_config(str(path), 'a')